@@ -1,6 +1,7 @@
 import random
 import time
 from itertools import product
+from collections import defaultdict
 from collections.abc import Iterable, Callable
 from pathlib import Path
 
@@ -127,116 +128,152 @@ class Vocabulary:
             "TUNE", "PINE", "LENS", "NEARS", "SENSE",
         ]
         words = []
-        for word in list(set(vocabulary)):
-            word = word.strip().upper()
+        for word in {word.strip().upper() for word in vocabulary}:
             if filter is None or filter(word):
                 words.append(word)
-        random.shuffle(words)
-        return words[:limit]
+        return random.sample(words, min(limit, len(words)))
     
     @staticmethod
     def from_file(file_path: str, limit: int = 1000, *, filter: Callable[[str], bool]|None = None) -> list[str]:
-        reservoir = []
-        with open(file_path, 'r') as file:
-            for i, line in enumerate(file):
-                word = line.strip().upper()
-                if filter is not None and not filter(word):
-                    continue
-                elif len(reservoir) < limit:
-                    reservoir.append(word)
-                else:
-                    j = random.randint(0, i)
-                    if j < limit:
-                        reservoir[j] = word
-        random.shuffle(reservoir)
-        return reservoir
+        limit = max(0, limit)
+        words = Vocabulary.load_words(file_path)
+        if filter is not None:
+            words = [word for word in words if filter(word)]
+        return random.sample(words, min(limit, len(words)))
+
+    @staticmethod
+    def load_words(file_path: str) -> list[str]:
+        '''Load the stripped, uppercased words of a file, one per line'''
+        return [line.strip() for line in Path(file_path).read_text().upper().splitlines()]
 
-type Board = list[list[str | None]]
-type FilledBoard = list[list[str]]
-type Position = tuple[int, int]
+type Board = bytearray
 type Direction = tuple[int, int]
 
 def init_board(board_size: int) -> Board:
-    return [[None for _ in range(board_size)] for _ in range(board_size)]
+    '''Create a flat row-major board where 0 marks an empty cell and letters are stored as ASCII codes'''
+    return bytearray(board_size * board_size)
 
 def create_all_directions() -> list[Direction]:
     '''Create a list of horizontal, vertical and diagonal directions'''
-    return [direction for direction in product([-1, 0, 1], [-1, 0, 1]) if direction[0] != 0 and direction[1] != 0]
+    return [direction for direction in product([-1, 0, 1], [-1, 0, 1]) if direction != (0, 0)]
 
 def populate_board(board: Board, board_size: int, vocabulary: Iterable[str], directions: list[Direction]):
     """Populate the board with words randomly"""
-    positions = list[Position](product(range(0, board_size - 1), range(0, board_size - 1)))
-    pop_positions = list[Position]()
+    # Once the board is nearly full, give up on word lengths that keep failing to fit (and anything longer)
+    SATURATION_RATIO = 0.85
+    MAX_CONSECUTIVE_FAILURES = 30
+    max_empty_cells = int(board_size * board_size * (1 - SATURATION_RATIO))
+    consecutive_failures_by_length = defaultdict[int, int](int)
+    max_word_length = board_size
+    # Index cells by content (0 for empty) so each word only samples starts compatible with its first letter
+    starts_by_code = defaultdict[int, set[int]](set)
+    for index, code in enumerate(board):
+        starts_by_code[code].add(index)
+    # Draw direction indices straight from random bits; with 8 directions no draw is ever rejected
+    n_directions = len(directions)
+    if n_directions == 0:
+        raise ValueError("directions must not be empty")
+    direction_bits = (n_directions - 1).bit_length()
+    strides = direction_strides(board_size, directions)
+    try_place_word = make_word_placer(board, board_size, directions, strides)
+    # Bind the RNG methods once; the module-level functions share the global seedable instance
+    rand = random.random
+    getrandbits = random.getrandbits
     words = list[str]()
-    max_length = 0
     for word in vocabulary:
-        positions += pop_positions
-        pop_positions.clear()
-        random.shuffle(positions)
+        if not word or len(word) > max_word_length:  # Nothing to place, or cannot fit
+            continue
+        word_bytes = word.encode('ascii')
+        starts = list(starts_by_code[0] | starts_by_code[word_bytes[0]])
+        # Partial Fisher-Yates: swap each drawn start behind the untried ones instead of reshuffling.
+        # Indices are scaled from random() like random.choices does; randrange's checks would cost
+        # more than shuffle + pop for words that exhaust every start.
+        remaining = len(starts)
         placed = False
-        while not placed and len(positions) != 0:
-            position = positions.pop()
-            pop_positions.append(position)
-            direction = random.choice(directions)
-            if can_place_word(board, board_size, word, position, direction):
-                place_word(board, word, position, direction)
+        while not placed and remaining != 0:
+            j = int(rand() * remaining)
+            remaining -= 1
+            start = starts[j]
+            starts[j] = starts[remaining]
+            starts[remaining] = start
+            k = getrandbits(direction_bits)
+            while k >= n_directions:
+                k = getrandbits(direction_bits)
+            if try_place_word(word_bytes, start, k):
+                stride = strides[k]
+                for code in word_bytes:
+                    starts_by_code[0].discard(start)
+                    starts_by_code[code].add(start)
+                    start += stride
                 words.append(word)
-                max_length = max(len(word), max_length)
                 placed = True
+        if placed:
+            consecutive_failures_by_length[len(word)] = 0
+        else:
+            consecutive_failures_by_length[len(word)] += 1
+            if consecutive_failures_by_length[len(word)] > MAX_CONSECUTIVE_FAILURES\
+                    and board.count(0) <= max_empty_cells:
+                max_word_length = len(word) - 1
+    max_length = max((len(word) for word in words), default=0)
     return (words, max_length)
 
-def can_place_word(board: Board, board_size: int, word: str, position: Position, direction: Direction):
-    """Check if a word can be placed starting at pos=(row, col) in the given direction."""
-    row, col = position
-    d_row, d_col = direction
-    for i, char in enumerate(word):
-        r, c = row + i * d_row, col + i * d_col
-        if r < 0 or r >= board_size or c < 0 or c >= board_size:
-            return False
-        if board[r][c] not in (None, char):  # Conflict check
-            return False
-    return True
+def direction_strides(board_size: int, directions: list[Direction]) -> list[int]:
+    """Compute the flat index step of each direction on a row-major board."""
+    return [d_row * board_size + d_col for d_row, d_col in directions]
+
+def make_word_placer(board: Board, board_size: int, directions: list[Direction],\
+                     strides: list[int]) -> Callable[[bytes, int, int], bool]:
+    """Create a word placer specialized for one board, using each direction's precomputed flat stride."""
 
-def place_word(board: Board, word: str, position: Position, direction: Direction):
-    """Place a word on the board."""
-    row, col = position
-    d_row, d_col = direction
-    for i, char in enumerate(word):
-        r, c = row + i * d_row, col + i * d_col
-        board[r][c] = char
+    def try_place_word(word: bytes, start: int, k: int) -> bool:
+        """Place a word starting at cell index `start` in directions[k] if it fits without conflicts."""
+        row, col = divmod(start, board_size)
+        d_row, d_col = directions[k]
+        # The start is always on the board and cells lie on a straight line, so only the end needs a bounds check
+        last = len(word) - 1
+        end_row, end_col = row + last * d_row, col + last * d_col
+        if not (0 <= end_row < board_size and 0 <= end_col < board_size):
+            return False
+        stride = strides[k]
+        # Walk the line cell by cell so the usual early conflict exits without copying the line
+        index = start
+        for char in word:
+            cell = board[index]
+            if cell and cell != char:  # Conflict check
+                return False
+            index += stride
+        # Scatter the whole word with one extended slice assignment once it is known to fit
+        stop = start + (last + 1) * stride
+        board[start : stop if stop >= 0 else None : stride] = word
+        return True
 
-def fill_empty_cells(board: Board, board_size: int) -> FilledBoard:
-    '''Fill empty cells with random letters'''
-    start_codepoint = ord('A')
-    end_codepoint = ord('Z')
-    for row in range(board_size):
-        for col in range(board_size):
-            if board[row][col] is None:
-                board[row][col] = chr(random.randint(start_codepoint, end_codepoint))
-    return board
+    return try_place_word
 
-def board_to_heredoc(board: FilledBoard):
-    '''Convert board to heredoc format'''
-    return "\n".join(" ".join(row) for row in board)
+def fill_board_to_heredoc(board: Board, board_size: int):
+    '''Convert board to heredoc format, filling empty cells with random letters on the way'''
+    if board_size == 0:
+        return ''
+    codepoints = range(ord('A'), ord('Z') + 1)
+    # Draw every filler letter in one batched call rather than one randint per empty cell
+    letters = iter(random.choices(codepoints, k=board.count(0)))
+    # Each row is laid out as "C C ... C\n": letters at even offsets, separators in between
+    row_width = 2 * board_size
+    heredoc = bytearray(b' ' * (row_width * board_size))
+    heredoc[0::2] = bytes(cell or next(letters) for cell in board)
+    heredoc[row_width-1::row_width] = b'\n' * board_size
+    return heredoc[:-1].decode('ascii')
 
 def words_to_formatted_2d(words: list[str], n_words_per_row: int,\
                                   word_justified_length: int, display: bool|None = None):
     '''Convert words list to a formatted string of 2d array'''
-    word_rows = list[list[str]]()
-    displayed_word_rows = list[list[str]]()
-    n_words = len(words)
-    n_inserted_words = 0
-    while n_inserted_words < n_words:
-        n_row_words = min(n_words - n_inserted_words, n_words_per_row)
-        inserted_words = words[n_inserted_words : n_inserted_words+n_row_words]
-        row = [f"'{word}'".ljust(word_justified_length + 2) for word in inserted_words]
-        word_rows.append(row)
-        if display:
-            displayed_row = [word.ljust(word_justified_length) for word in inserted_words]
-            displayed_word_rows.append(displayed_row)
-        n_inserted_words += n_row_words
-    formatted_words = ",\n".join(", ".join(row) for row in word_rows) + ","
-    displayed_words = "\n".join("  ".join(row) for row in displayed_word_rows) if display else ''
+    row_starts = range(0, len(words), n_words_per_row)
+    quoted_words = [f"'{word}'".ljust(word_justified_length + 2) for word in words]
+    formatted_words = ",\n".join(", ".join(quoted_words[start : start+n_words_per_row]) for start in row_starts) + ","
+    if display:
+        justified_words = [word.ljust(word_justified_length) for word in words]
+        displayed_words = "\n".join("  ".join(justified_words[start : start+n_words_per_row]) for start in row_starts)
+    else:
+        displayed_words = ''
     return (formatted_words, displayed_words)
 
 def save_text_file(filepath: str, text: str):
@@ -257,13 +294,12 @@ def main():
     board = init_board(board_size)
     directions = create_all_directions()
     words, max_length = populate_board(board, board_size, vocabulary, directions)
-    board = fill_empty_cells(board, board_size)
 
     words.sort()
     n_words = len(words)
     should_display_words = n_words <= WORDS_DISPLAY_THRESHOLD
 
-    heredoc_board = board_to_heredoc(board)
+    heredoc_board = fill_board_to_heredoc(board, board_size)
     formatted_words, displayed_words = words_to_formatted_2d(words, n_words_per_row, max_length, should_display_words)
 
     board_path = "./out/word-search-board.txt"